@@ -1,8 +1,53 @@
 import datetime
 import yaml
 import os, sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Prefer the libyaml-backed loader/dumper when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# Buffer size for reading and writing yaml data files
+_FILE_BUFFER_SIZE = 1 << 17
+
+# Lowercase month names used in data file names, indexed by month number (1-12)
+_MONTH_NAMES = ("", "january", "february", "march", "april", "may", "june",
+                "july", "august", "september", "october", "november", "december")
+_MONTH_NUMBERS = {name: number for number, name in enumerate(_MONTH_NAMES) if name}
+
+# Stored in place of a missing priority so it never passes a min_priority filter;
+# priorities that can be indexed lie strictly between it and _MAX_PRIORITY
+_NO_PRIORITY = -(1 << 63)
+_MAX_PRIORITY = (1 << 63) - 1
+
+def _month_window(year: int, month: int):
+    '''
+    Get the months from two months before to two months after a given month.
+    :param year: Year number
+    :param month: Month number (1-12)
+    :return: List of (month, year) tuples in calendar order
+    '''
+    # Count months as year * 12 + (month - 1) so a single divmod recovers month and year
+    now_idx = year * 12 + (month - 1)
+    return [(idx % 12 + 1, idx // 12) for idx in range(now_idx - 2, now_idx + 3)]
+
+def _load_yaml(path: str):
+    '''
+    Load a single yaml data file.
+    :param path: Path to the yaml file
+    :return: Parsed file contents and the modification time of the file
+    '''
+    with open(path, 'r', buffering=_FILE_BUFFER_SIZE) as file:
+        return yaml.load(file, Loader=_Loader), os.fstat(file.fileno()).st_mtime
 
 class Events:
+    __slots__ = ("event_id", "event_name", "event_description", "event_date", "event_time",
+                 "event_location", "event_type", "event_status", "event_priority", "event_notes",
+                 "event_reminder", "_row")
+
     def __init__(self,
                 event_id: int,
                 event_name: str,
@@ -30,6 +75,9 @@ class Events:
         :param event_notes: Additional notes for the event
         :param event_reminder: Reminder for the event
         '''
+        # Row the event was loaded from and its field values at load time;
+        # reused on save while the fields are unchanged
+        self._row = None
         self.event_id = event_id
         self.event_name = event_name
         self.event_description = event_description
@@ -59,19 +107,63 @@ class Events:
         Print the event date in a readable format.
         :return: Formatted date string
         '''
-        return self.event_date.strftime("%Y-%m-%d")
+        d = self.event_date
+        return f"{d.year:04d}-{d.month:02d}-{d.day:02d}"
     def print_time(self):
         '''
         Print the event time in a readable format.
         :return: Formatted time string
         '''
-        return self.event_time.strftime("%H:%M") if self.event_time else None
+        t = self.event_time
+        return f"{t.hour:02d}:{t.minute:02d}" if t else None
     def print_event(self):
         '''
         Print the event details in a readable format.
         :return: Formatted event string
         '''
-        return f"Event: {self.event_name}, Description: {self.event_description}, Date: {self.print_date()}, Time: {self.print_time()}, Location: {self.event_location}, Notes: {self.event_notes}"
+        d = self.event_date
+        t = self.event_time
+        time_s = f"{t.hour:02d}:{t.minute:02d}" if t else None
+        return f"Event: {self.event_name}, Description: {self.event_description}, Date: {d.year:04d}-{d.month:02d}-{d.day:02d}, Time: {time_s}, Location: {self.event_location}, Notes: {self.event_notes}"
+    def _snapshot(self):
+        '''
+        Get the event as a row for the yaml file, reusing the stored row if the event is unchanged.
+        :return: Dictionary of the event fields
+        '''
+        if self._row is not None:
+            row, fields = self._row
+            # Any field assigned since loading fails this check, so direct edits are saved too
+            if fields == self._fields():
+                return row
+            self._row = None
+        r = self.event_reminder
+        return {
+            "event_id": self.event_id,
+            "event_name": self.event_name,
+            "event_description": self.event_description,
+            "event_date": self.print_date(),
+            "event_time": self.print_time(),
+            "event_location": self.event_location,
+            "event_type": self.event_type,
+            "event_status": self.event_status,
+            "event_priority": self.event_priority,
+            "event_notes": self.event_notes,
+            "event_reminder": f"{r.year:04d}-{r.month:02d}-{r.day:02d} {r.hour:02d}:{r.minute:02d}" if r else None,
+        }
+    def _fields(self):
+        '''
+        Get the values of the event's fields.
+        :return: Tuple of field values
+        '''
+        return (self.event_id, self.event_name, self.event_description, self.event_date,
+                self.event_time, self.event_location, self.event_type, self.event_status,
+                self.event_priority, self.event_notes, self.event_reminder)
+    def _touch(self):
+        '''
+        Drop the row the event was loaded from, so it is rebuilt on the next save.
+        Called by Month whenever an event is added, removed or updated.
+        '''
+        self._row = None
     def __str__(self):
         '''
         String representation of the event.
@@ -86,6 +178,8 @@ class Events:
         return self.__str__()
     
 class Month:
+    __slots__ = ("_month", "_year", "_events", "_by_date", "_date_ordinals", "_priorities")
+
     def __init__(self,
                 month: int,
                 year: int,
@@ -99,7 +193,16 @@ class Month:
         '''
         self._month = month
         self._year = year
-        self._events = events if events is not None else []  # Initialize a new list if None
+        # Events are indexed by event_id for constant-time lookups
+        self._events: dict[int, Events] = {}
+        # Events sorted by date with parallel arrays of date ordinals and
+        # priorities, so queries scan flat arrays instead of events. Rebuilt by
+        # get_events_between after any change; None while out of date.
+        self._by_date: list[Events] = None
+        self._date_ordinals = array('q')
+        self._priorities = array('q')
+        for event in events if events is not None else []:
+            self._add_event_unchecked(event)
     
     def get_month(self):
         '''
@@ -118,50 +221,101 @@ class Month:
         Get the list of events for the month.
         :return: List of events
         '''
-        return self._events
+        return list(self._events.values())
+    def get_events_between(self, start: datetime, end: datetime, min_priority: int = None):
+        '''
+        Get the events dated within a range, optionally filtered by priority.
+        Events without a priority never match a min_priority filter.
+        :param start: First date of the range
+        :param end: Last date of the range
+        :param min_priority: Lowest priority to include, or None for all events
+        :return: List of events sorted by date
+        '''
+        if self._by_date is None:
+            self._build_index()
+        if min_priority is not None and self._priorities is None:
+            raise TypeError("filtering by priority requires 64-bit integer event priorities")
+        lo = bisect_left(self._date_ordinals, start.toordinal())
+        hi = bisect_right(self._date_ordinals, end.toordinal())
+        if min_priority is None:
+            return self._by_date[lo:hi]
+        by_date, priorities = self._by_date, self._priorities
+        return [by_date[i] for i in range(lo, hi) if priorities[i] >= min_priority]
+    def _build_index(self):
+        '''
+        Sort the events by date and rebuild the date and priority arrays.
+        The priority array is None if any event has a priority that is not an
+        integer above _NO_PRIORITY and at most _MAX_PRIORITY.
+        '''
+        self._by_date = sorted(self._events.values(), key=lambda event: event.event_date.toordinal())
+        self._date_ordinals = array('q', [event.event_date.toordinal() for event in self._by_date])
+        priorities = [event.event_priority for event in self._by_date]
+        if all(priority is None or (isinstance(priority, int) and _NO_PRIORITY < priority <= _MAX_PRIORITY)
+               for priority in priorities):
+            self._priorities = array('q', [_NO_PRIORITY if priority is None else priority for priority in priorities])
+        else:
+            self._priorities = None
     def add_event(self, event: Events):
         '''
         Add an event to the month.
         :param event: Event to be added
         '''
-        if type(event) is not Events:
+        if not isinstance(event, Events):
             raise TypeError("event must be of type Events")
         if event.get_month() != self._month or event.get_year() != self._year:
             raise ValueError("event month and year must match month and year of the Month object")
-        # Check if the event already exists
-        for e in self._events:
-            if e.event_id == event.event_id:
-                raise ValueError("event already exists in the month")
-        # Add the event to the month
-        self._events.append(event)
+        # Add the event to the month; existing event ids are rejected
+        self._add_event_unchecked(event)
+        event._touch()
+    def _add_event_unchecked(self, event: Events):
+        '''
+        Add an event to the month without checking its type or date.
+        Only for callers that built the event for this month themselves.
+        :param event: Event to be added
+        '''
+        if event.event_id in self._events:
+            raise ValueError("event already exists in the month")
+        self._events[event.event_id] = event
+        self._by_date = None
     def remove_event(self, event: Events):
         '''
         Remove an event from the month.
         :param event: Event to be removed
         '''
-        if type(event) is not Events:
+        if not isinstance(event, Events):
             raise TypeError("event must be of type Events")
-        if event not in self._events:
-            raise ValueError("event not found in the month")
-        self._events.remove(event)
+        try:
+            del self._events[event.event_id]
+        except KeyError:
+            raise ValueError("event not found in the month") from None
+        event._touch()
+        self._by_date = None
     def update_event(self, event: Events):
         '''
         Update an event in the month.
+        Call this after changing any field of an event, so the date and
+        priority index is refreshed.
         :param event: Event to be updated
         '''
-        if type(event) is not Events:
+        if not isinstance(event, Events):
             raise TypeError("event must be of type Events")
-        if event not in self._events:
+        if event.event_id not in self._events:
             raise ValueError("event not found in the month")
-        index = self._events.index(event)
-        self._events[index] = event
+        event._touch()
+        self._events[event.event_id] = event
+        self._by_date = None
         
 class DataController:
     def __init__(self):
         '''
-        Initialize the DataController with an empty list of months.
+        Initialize the DataController with an empty index of months.
         '''
-        self._months = []
+        # Months are indexed by (month, year) for constant-time lookups
+        self._months: dict[tuple[int, int], Month] = {}
+        # Paths of stored month files; each is parsed into _months on first use
+        self._month_paths: dict[tuple[int, int], str] = {}
+        # Modification times of month files as of their last load or save
+        self._file_mtimes: dict[str, float] = {}
         self._start_up()
     
     def _start_up(self):
@@ -170,82 +324,132 @@ class DataController:
         '''
         # load data from the 'data_storage' directory
         # For each month, load the events from the database
-        file_list = os.listdir("data_storage")
         current_date = datetime.datetime.now()
         current_month = current_date.month
         current_year = current_date.year
 
         # Calculate the range of months to include
-        start_month = (current_month - 2) % 12 or 12
-        start_year = current_year if current_month > 2 else current_year - 1
-        end_month = (current_month + 2) % 12 or 12
-        end_year = current_year if current_month <= 10 else current_year + 1
+        window = _month_window(current_year, current_month)
+        start_month, start_year = window[0]
+        end_month, end_year = window[-1]
 
         #print the month ranges to console
         print(f"Loading events from {start_month}/{start_year} to {end_month}/{end_year}")
-                    
-        for file_name in file_list:
-            # check if the file is a yaml file
-            if file_name.endswith(".yaml"):
-                # load the events from the yaml file, using the yaml module
-                with open(f"data_storage/{file_name}", 'r') as file:
-                    data = yaml.safe_load(file)
-                    
-                    
-                    # Skip months outside the range
-                    if not data or \
-                       (data['year'] < start_year or (data['year'] == start_year and data['month'] < start_month)) or \
-                       (data['year'] > end_year or (data['year'] == end_year and data['month'] > end_month)):
-                        continue
-                    month = Month(data['month'], data['year'])
-                    for event_data in data["events"]:
-                        event = Events(
-                            event_id=event_data["event_id"],
-                            event_name=event_data["event_name"],
-                            event_description=event_data["event_description"],
-                            event_date=datetime.datetime.strptime(event_data["event_date"], "%Y-%m-%d"),
-                            event_time=datetime.datetime.strptime(event_data["event_time"], "%H:%M") if event_data["event_time"] else None,
-                            event_location=event_data["event_location"],
-                            event_type=event_data["event_type"],
-                            event_status=event_data["event_status"],
-                            event_priority=event_data["event_priority"],
-                            event_notes=event_data["event_notes"],
-                            event_reminder=datetime.datetime.strptime(event_data["event_reminder"], "%Y-%m-%d %H:%M") if event_data["event_reminder"] else None,
-                        )
-                        month.add_event(event)
-                    self._months.append(month)
+
+        # Files are named after their month and year (e.g. "may2025.yaml"), so
+        # they can be indexed without being parsed
+        # scandir's cached entry type lets us skip non-files without extra stats
+        month_paths = {}
+        with os.scandir("data_storage") as it:
+            for entry in it:
+                if not entry.name.endswith(".yaml") or not entry.is_file():
+                    continue
+                stem = entry.name[:-len(".yaml")]
+                month_name = stem.rstrip("0123456789")
+                year = stem[len(month_name):]
+                if month_name in _MONTH_NUMBERS and year:
+                    key = (_MONTH_NUMBERS[month_name], int(year))
+                    month_paths[key] = entry.path
+                    # Drop loaded months whose file changed since it was last read or written
+                    if key in self._months and self._file_mtimes.get(entry.path) != entry.stat().st_mtime:
+                        del self._months[key]
+        # Drop loaded months whose file was removed; months never saved are kept
+        for key, path in self._month_paths.items():
+            if key not in month_paths and path in self._file_mtimes:
+                self._months.pop(key, None)
+                del self._file_mtimes[path]
+        self._month_paths = month_paths
+
+        # Eagerly load only the months in range; the rest are loaded on demand.
+        # Months already loaded from an unchanged file are kept as they are
+        for key in window:
+            self._load_month(key)
+    
+    def _build_month(self, key: tuple[int, int], data: dict):
+        '''
+        Build a Month from the parsed contents of its yaml file.
+        :param key: (month, year) of the file
+        :param data: Parsed file contents
+        :return: Month holding the stored events
+        '''
+        month = Month(*key)
+        # Empty files hold no events
+        if not data:
+            return month
+        if (data["month"], data["year"]) != key:
+            raise ValueError(f"month file for {key[0]}/{key[1]} holds data for {data['month']}/{data['year']}")
+        # Resolve the parsers once per file rather than once per field of every row
+        parse_date = datetime.date.fromisoformat
+        parse_time = datetime.time.fromisoformat
+        parse_datetime = datetime.datetime.fromisoformat
+        for event_data in data["events"]:
+            event_date = parse_date(event_data["event_date"])
+            if (event_date.month, event_date.year) != key:
+                raise ValueError(f"event {event_data['event_id']} is not dated in {key[0]}/{key[1]}")
+            event_time = event_data["event_time"]
+            event_reminder = event_data["event_reminder"]
+            event = Events(
+                event_id=event_data["event_id"],
+                event_name=event_data["event_name"],
+                event_description=event_data["event_description"],
+                event_date=event_date,
+                event_time=parse_time(event_time) if event_time else None,
+                event_location=event_data["event_location"],
+                event_type=event_data["event_type"],
+                event_status=event_data["event_status"],
+                event_priority=event_data["event_priority"],
+                event_notes=event_data["event_notes"],
+                event_reminder=parse_datetime(event_reminder) if event_reminder else None,
+            )
+            # The stored row is already in saved form, so unchanged events are not re-formatted
+            event._row = (event_data, event._fields())
+            # The date was checked against the month above, so skip the type check;
+            # duplicate ids are still rejected
+            month._add_event_unchecked(event)
+        return month
+    
+    def _load_month(self, key: tuple[int, int]):
+        '''
+        Get a month, parsing its yaml file the first time it is needed.
+        :param key: (month, year) of the month
+        :return: The Month, or None if it is neither loaded nor stored
+        '''
+        month = self._months.get(key)
+        if month is None and key in self._month_paths:
+            try:
+                data, mtime = _load_yaml(self._month_paths[key])
+            except FileNotFoundError:
+                # The file was removed since it was indexed; treat the month as not stored
+                del self._month_paths[key]
+                return None
+            month = self._build_month(key, data)
+            self._months[key] = month
+            self._file_mtimes[self._month_paths[key]] = mtime
+        return month
     
     def shut_down(self):
         '''
         Shut down the DataController by saving data to the database.
         '''
         # For each month, save the events to the database
-        for month in self._months:
+        for month in self._months.values():
             # create a yaml file name based on month and year
-            file_name = f"data_storage/{datetime.date(1900, month.get_month(), 1).strftime('%B').lower()}{month.get_year()}.yaml"
+            file_name = f"data_storage/{_MONTH_NAMES[month.get_month()]}{month.get_year()}.yaml"
             # save the events to the yaml file, using the yaml module
-            with open(file_name, 'w') as file:
-                data = {
-                    "month": month.get_month(),
-                    "year": month.get_year(),
-                    "events": [
-                        {
-                            "event_id": event.event_id,
-                            "event_name": event.event_name,
-                            "event_description": event.event_description,
-                            "event_date": event.print_date(),
-                            "event_time": event.print_time(),
-                            "event_location": event.event_location,
-                            "event_type": event.event_type,
-                            "event_status": event.event_status,
-                            "event_priority": event.event_priority,
-                            "event_notes": event.event_notes,
-                            "event_reminder": event.event_reminder.strftime("%Y-%m-%d %H:%M") if event.event_reminder else None,
-                        }
-                        for event in month.get_events()
-                    ],
-                }
-                yaml.dump(data, file, default_flow_style=False)
+            # Events are dumped one at a time so no list of every row is built;
+            # the layout matches a single yaml.dump of the whole month
+            with open(file_name, 'w', buffering=_FILE_BUFFER_SIZE) as file:
+                events = month.get_events()
+                if not events:
+                    file.write("events: []\n")
+                else:
+                    file.write("events:\n")
+                    for event in events:
+                        yaml.dump([event._snapshot()], file, Dumper=_Dumper, default_flow_style=False)
+                yaml.dump({"month": month.get_month(), "year": month.get_year()}, file, Dumper=_Dumper, default_flow_style=False)
+                file.flush()
+                self._file_mtimes[file_name] = os.fstat(file.fileno()).st_mtime
+            self._month_paths[(month.get_month(), month.get_year())] = file_name
     
     def demo_start_up(self):
         '''
@@ -279,44 +483,39 @@ class DataController:
         month3.add_event(event6)
         
         # Add months to the DataController
-        self._months.append(month1)
-        self._months.append(month2)
-        self._months.append(month3)
+        self._months[(1, 2023)] = month1
+        self._months[(2, 2023)] = month2
+        self._months[(3, 2023)] = month3
         
     def add_event(self, event: Events):
         '''
         Add an event to the DataController.
         :param event: Event to be added
         '''
-        if type(event) is not Events:
+        if not isinstance(event, Events):
             raise TypeError("event must be of type Events")
-        # Check if the event already exists
-        for month in self._months:
-            if month.get_month() == event.event_date.month and month.get_year() == event.event_date.year:
-                if event in month.get_events():
-                    raise ValueError("event already exists in the month")
-                # Add the event to the appropriate month
-                month.add_event(event)
-                return
-        # Month and Year not found; create a new one
-        new_month = Month(event.event_date.month, event.event_date.year)
-        new_month.add_event(event)
-        self._months.append(new_month)
+        key = (event.event_date.month, event.event_date.year)
+        month = self._load_month(key)
+        if month is None:
+            # Month and Year not found; create a new one
+            month = Month(*key)
+            self._months[key] = month
+        # Add the event to the appropriate month; Month rejects duplicate ids
+        month.add_event(event)
     
     def remove_event(self, event: Events):
         '''
         Remove an event from the DataController.
         :param event: Event to be removed
         '''
-        if type(event) is not Events:
+        if not isinstance(event, Events):
             raise TypeError("event must be of type Events")
         # Check if the event exists
-        for month in self._months:
-            if month.get_month() == event.event_date.month and month.get_year() == event.event_date.year:
-                if event in month.get_events():
-                    # Remove the event from the appropriate month
-                    month.remove_event(event)
-                    return
+        month = self._load_month((event.event_date.month, event.event_date.year))
+        if month is not None and event.event_id in month._events:
+            # Remove the event from the appropriate month
+            month.remove_event(event)
+            return
         raise ValueError("event not found in the DataController")
     
     def update_event(self, event: Events):
@@ -324,15 +523,14 @@ class DataController:
         Update an event in the DataController.
         :param event: Event to be updated
         '''
-        if type(event) is not Events:
+        if not isinstance(event, Events):
             raise TypeError("event must be of type Events")
         # Check if the event exists
-        for month in self._months:
-            if month.get_month() == event.event_date.month and month.get_year() == event.event_date.year:
-                if event in month.get_events():
-                    # Update the event in the appropriate month
-                    month.update_event(event)
-                    return
+        month = self._load_month((event.event_date.month, event.event_date.year))
+        if month is not None and event.event_id in month._events:
+            # Update the event in the appropriate month
+            month.update_event(event)
+            return
         raise ValueError("event not found in the DataController")
     
     def get_events(self, month: int, year: int):
@@ -342,19 +540,18 @@ class DataController:
         :param year: Year number
         :return: List of events for the specified month and year
         '''
-        for m in self._months:
-            if m.get_month() == month and m.get_year() == year:
-                return m.get_events()
-        return []
+        m = self._load_month((month, year))
+        return m.get_events() if m is not None else []
     
 if __name__ == "__main__":
     # Create a DataController instance
     controller = DataController()
     
-    # Print the events that it was started with
-    for month in controller._months:
-        print(f"Month: {month.get_month()}, Year: {month.get_year()}")
-        for event in month.get_events():
-            print(event)
+    # Print the events that it was started with when SC_DEBUG is set
+    if os.environ.get("SC_DEBUG"):
+        for month in controller._months.values():
+            print(f"Month: {month.get_month()}, Year: {month.get_year()}")
+            for event in month.get_events():
+                print(event)
             
     controller.shut_down()
\ No newline at end of file
@@ -1,6 +1,9 @@
 import unittest
 import datetime
-from src.events import Events, Month, DataController
+import os
+import tempfile
+import yaml
+from src.events import Events, Month, DataController, _month_window
 
 class TestEvents(unittest.TestCase):
     def test_event_initialization(self):
@@ -21,6 +24,30 @@ class TestEvents(unittest.TestCase):
         self.assertEqual(event.get_month(), 5)
         self.assertEqual(event.get_year(), 2023)
 
+    def test_print_date_and_time(self):
+        event = Events(
+            event_id=1,
+            event_name="Meeting",
+            event_description="Team meeting",
+            event_date=datetime.date(2023, 5, 9),
+            event_time=datetime.time(7, 5),
+        )
+        self.assertEqual(event.print_date(), "2023-05-09")
+        self.assertEqual(event.print_time(), "07:05")
+
+class TestMonthWindow(unittest.TestCase):
+    def test_january(self):
+        self.assertEqual(_month_window(2025, 1), [(11, 2024), (12, 2024), (1, 2025), (2, 2025), (3, 2025)])
+
+    def test_february(self):
+        self.assertEqual(_month_window(2025, 2), [(12, 2024), (1, 2025), (2, 2025), (3, 2025), (4, 2025)])
+
+    def test_november(self):
+        self.assertEqual(_month_window(2025, 11), [(9, 2025), (10, 2025), (11, 2025), (12, 2025), (1, 2026)])
+
+    def test_december(self):
+        self.assertEqual(_month_window(2025, 12), [(10, 2025), (11, 2025), (12, 2025), (1, 2026), (2, 2026)])
+
 class TestMonth(unittest.TestCase):
     def setUp(self):
         self.month = Month(5, 2023)
@@ -46,6 +73,74 @@ class TestMonth(unittest.TestCase):
         self.month.remove_event(event)
         self.assertNotIn(event, self.month.get_events())
 
+    def test_add_duplicate_event(self):
+        event = Events(
+            event_id=1,
+            event_name="Meeting",
+            event_description="Team meeting",
+            event_date=datetime.datetime(2023, 5, 10),
+        )
+        self.month.add_event(event)
+        with self.assertRaises(ValueError):
+            self.month.add_event(event)
+
+    def test_update_event(self):
+        event = Events(
+            event_id=1,
+            event_name="Meeting",
+            event_description="Team meeting",
+            event_date=datetime.datetime(2023, 5, 10),
+        )
+        updated = Events(
+            event_id=1,
+            event_name="Standup",
+            event_description="Daily standup",
+            event_date=datetime.datetime(2023, 5, 10),
+        )
+        self.month.add_event(event)
+        self.month.update_event(updated)
+        self.assertEqual(self.month.get_events(), [updated])
+
+    def test_get_events_between(self):
+        early = Events(1, "Meeting", "Team meeting", datetime.date(2023, 5, 3), event_priority=1)
+        middle = Events(2, "Review", "Code review", datetime.date(2023, 5, 12), event_priority=3)
+        late = Events(3, "Retro", "Sprint retro", datetime.date(2023, 5, 28), event_priority=2)
+        unset = Events(4, "Lunch", "Team lunch", datetime.date(2023, 5, 28))
+        for event in (late, early, unset, middle):
+            self.month.add_event(event)
+        between = self.month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 20))
+        self.assertEqual(between, [early, middle])
+        urgent = self.month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 31), min_priority=2)
+        self.assertEqual(urgent, [middle, late])
+        self.month.remove_event(middle)
+        between = self.month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 20))
+        self.assertEqual(between, [early])
+
+    def test_get_events_between_after_update(self):
+        event = Events(1, "Meeting", "Team meeting", datetime.date(2023, 5, 3))
+        self.month.add_event(event)
+        self.assertEqual(self.month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 5)), [event])
+        event.event_date = datetime.date(2023, 5, 30)
+        self.month.update_event(event)
+        self.assertEqual(self.month.get_events_between(datetime.date(2023, 5, 29), datetime.date(2023, 5, 31)), [event])
+
+    def test_get_events_between_non_integer_priority(self):
+        event = Events("standup", "Standup", "Daily standup", datetime.date(2023, 5, 3), event_priority="high")
+        self.month.add_event(event)
+        self.assertEqual(self.month.get_events(), [event])
+        self.assertEqual(self.month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 5)), [event])
+        with self.assertRaises(TypeError):
+            self.month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 5), min_priority=1)
+
+    def test_get_events_between_out_of_range_priority(self):
+        for priority in (2 ** 63, -(2 ** 63)):
+            month = Month(5, 2023)
+            event = Events(1, "Standup", "Daily standup", datetime.date(2023, 5, 3), event_priority=priority)
+            month.add_event(event)
+            self.assertEqual(month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 5)), [event])
+            with self.assertRaises(TypeError):
+                month.get_events_between(datetime.date(2023, 5, 1), datetime.date(2023, 5, 5), min_priority=1)
+
     def test_add_event_invalid_date(self):
         event = Events(
             event_id=1,
@@ -81,5 +176,161 @@ class TestDataController(unittest.TestCase):
         events = self.controller.get_events(5, 2023)
         self.assertEqual(len(events), 0)
 
+    def test_get_events_loads_stored_month(self):
+        events = self.controller.get_events(1, 2023)
+        self.assertEqual(sorted(event.event_id for event in events), [1, 4])
+
+    def test_start_up_keeps_unchanged_months(self):
+        self.controller.get_events(1, 2023)
+        month = self.controller._months[(1, 2023)]
+        self.controller._start_up()
+        self.assertIs(self.controller._months[(1, 2023)], month)
+
+class TestDataControllerStorage(unittest.TestCase):
+    def setUp(self):
+        # Run each test against an empty data_storage in a temporary directory
+        cwd = os.getcwd()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(tmp.name)
+        os.mkdir("data_storage")
+        self.controller = DataController()
+
+    def read_file(self, name):
+        with open(os.path.join("data_storage", name)) as file:
+            return file.read()
+
+    def test_save_and_reload_month(self):
+        tricky = Events(
+            event_id=7,
+            event_name="Review: 'Q1' plan",
+            event_description="First line\nSecond line",
+            event_date=datetime.date(2023, 5, 10),
+            event_time=datetime.time(7, 0),
+            event_location="- Room 2",
+            event_priority=2,
+            event_reminder=datetime.datetime(2023, 5, 9, 18, 30),
+        )
+        plain = Events(
+            event_id=8,
+            event_name="Lunch",
+            event_description="Team lunch",
+            event_date=datetime.date(2023, 5, 12),
+        )
+        self.controller.add_event(tricky)
+        self.controller.add_event(plain)
+        self.controller.shut_down()
+
+        # The streamed file matches a single yaml.dump of the whole month
+        expected = yaml.dump({
+            "month": 5,
+            "year": 2023,
+            "events": [tricky._snapshot(), plain._snapshot()],
+        }, default_flow_style=False)
+        self.assertEqual(self.read_file("may2023.yaml"), expected)
+
+        events = DataController().get_events(5, 2023)
+        self.assertEqual([event.print_event() for event in events],
+                         [tricky.print_event(), plain.print_event()])
+        self.assertEqual(events[0].event_reminder, datetime.datetime(2023, 5, 9, 18, 30))
+        self.assertIsNone(events[1].event_time)
+        self.assertIsNone(events[1].event_reminder)
+
+    def test_save_empty_month(self):
+        event = Events(
+            event_id=1,
+            event_name="Meeting",
+            event_description="Team meeting",
+            event_date=datetime.date(2023, 6, 1),
+        )
+        self.controller.add_event(event)
+        self.controller.remove_event(event)
+        self.controller.shut_down()
+        expected = yaml.dump({"month": 6, "year": 2023, "events": []}, default_flow_style=False)
+        self.assertEqual(self.read_file("june2023.yaml"), expected)
+        self.assertEqual(DataController().get_events(6, 2023), [])
+
+    def test_save_edited_events(self):
+        for event_id, day in ((1, 10), (2, 20), (3, 25)):
+            self.controller.add_event(Events(event_id, "Meeting", "Team meeting", datetime.date(2023, 1, day)))
+        self.controller.shut_down()
+
+        controller = DataController()
+        updated, moved, direct = controller.get_events(1, 2023)
+        updated.event_name = "Standup"
+        controller.update_event(updated)
+        controller.remove_event(moved)
+        moved.event_date = datetime.date(2023, 2, 5)
+        moved.event_name = "Review"
+        controller.add_event(moved)
+        direct.event_notes = "Bring slides"
+        controller.shut_down()
+
+        controller = DataController()
+        january = controller.get_events(1, 2023)
+        self.assertEqual([(event.event_id, event.event_name, event.event_notes) for event in january],
+                         [(1, "Standup", None), (3, "Meeting", "Bring slides")])
+        february = controller.get_events(2, 2023)
+        self.assertEqual([(event.event_id, event.event_name, event.print_date()) for event in february],
+                         [(2, "Review", "2023-02-05")])
+
+    def test_get_events_after_file_removed(self):
+        with open(os.path.join("data_storage", "january2023.yaml"), "w") as file:
+            file.write("events: []\nmonth: 1\nyear: 2023\n")
+        controller = DataController()
+        os.remove(os.path.join("data_storage", "january2023.yaml"))
+        self.assertEqual(controller.get_events(1, 2023), [])
+
+    def test_start_up_drops_removed_months(self):
+        event = Events(
+            event_id=1,
+            event_name="Meeting",
+            event_description="Team meeting",
+            event_date=datetime.date(2023, 1, 10),
+        )
+        self.controller.add_event(event)
+        self.controller.shut_down()
+        os.remove(os.path.join("data_storage", "january2023.yaml"))
+        self.controller._start_up()
+        self.assertEqual(self.controller.get_events(1, 2023), [])
+
+    def test_load_rejects_duplicate_event_ids(self):
+        row = {
+            "event_id": 1,
+            "event_name": "Meeting",
+            "event_description": "Team meeting",
+            "event_date": "2023-01-10",
+            "event_time": None,
+            "event_location": None,
+            "event_type": None,
+            "event_status": None,
+            "event_priority": None,
+            "event_notes": None,
+            "event_reminder": None,
+        }
+        with open(os.path.join("data_storage", "january2023.yaml"), "w") as file:
+            yaml.dump({"month": 1, "year": 2023, "events": [row, dict(row)]}, file)
+        with self.assertRaises(ValueError):
+            DataController().get_events(1, 2023)
+
+    def test_load_rejects_event_from_other_month(self):
+        with open(os.path.join("data_storage", "january2023.yaml"), "w") as file:
+            yaml.dump({"month": 1, "year": 2023, "events": [{
+                "event_id": 1,
+                "event_name": "Meeting",
+                "event_description": "Team meeting",
+                "event_date": "2023-02-10",
+                "event_time": None,
+                "event_location": None,
+                "event_type": None,
+                "event_status": None,
+                "event_priority": None,
+                "event_notes": None,
+                "event_reminder": None,
+            }]}, file)
+        with self.assertRaises(ValueError):
+            DataController().get_events(1, 2023)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file